@@ -675,12 +675,15 @@ class DatabaseDriverFactory:
                 uri = os.environ.get('NEO4J_URI', neo4j_config.uri)
                 username = os.environ.get('NEO4J_USER', neo4j_config.username)
                 password = os.environ.get('NEO4J_PASSWORD', neo4j_config.password)
+                database = os.environ.get('NEO4J_DATABASE', neo4j_config.database)
 
                 return {
                     'uri': uri,
                     'user': username,
                     'password': password,
-                    # Note: database and use_parallel_runtime would need to be passed
+                    # Passed to the driver so every session names its database
+                    'database': database,
+                    # Note: use_parallel_runtime would need to be passed
                     # to the driver after initialization if supported
                 }
 
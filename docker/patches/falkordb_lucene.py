@@ -26,6 +26,8 @@ The patch provides:
 import logging
 import os
 import re
+import string
+from functools import lru_cache
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -45,8 +47,8 @@ def get_database_backend() -> str:
     Returns:
         'falkordb' or 'neo4j' (default is 'neo4j')
 
-    Note: This function always loads and checks the configured backend.
-    Sanitization functions use this to determine whether to apply escaping.
+    Note: This function always re-reads the environment. Sanitization
+    functions use the decision cached at import (see _refresh_backend()).
     """
     db_type = (
         os.getenv('MADEINOZ_KNOWLEDGE_DATABASE_TYPE') or
@@ -59,6 +61,17 @@ def get_database_backend() -> str:
     return 'neo4j'
 
 
+# Backend decision resolved once at import - the environment does not change
+# at runtime, and sanitizers run on every query build and episode write
+_REQUIRES_SANITIZATION: bool = get_database_backend() == 'falkordb'
+
+
+def _refresh_backend() -> None:
+    """Re-read the backend from the environment (for tests that switch backends)."""
+    global _REQUIRES_SANITIZATION
+    _REQUIRES_SANITIZATION = get_database_backend() == 'falkordb'
+
+
 def requires_lucene_sanitization() -> bool:
     """
     Check if Lucene sanitization is required for the current database backend.
@@ -66,7 +79,7 @@ def requires_lucene_sanitization() -> bool:
     Returns:
         True if using FalkorDB (requires Lucene sanitization), False for Neo4j
     """
-    return get_database_backend() == 'falkordb'
+    return _REQUIRES_SANITIZATION
 
 
 # ============================================================================
@@ -74,9 +87,15 @@ def requires_lucene_sanitization() -> bool:
 # ============================================================================
 
 # Lucene/RediSearch special characters that need escaping
-# Order matters: escape backslash first, then others
-# Pre-compile for performance (used frequently)
-LUCENE_SPECIAL_PATTERN = re.compile(r'[+\-&|!(){}\[\]^"~*?:/@#$%<>=]')
+LUCENE_SPECIAL_CHARS = '+-&|!(){}[]^"~*?:\\/@#$%<>='
+
+# Single-pass translation table (str.translate runs in C, one scan per call).
+# Escaping each character on its own also covers the two-character operators:
+# '&&' becomes '\&\&' and '||' becomes '\|\|', which is what RediSearch expects.
+_LUCENE_ESCAPE_TABLE = str.maketrans({c: '\\' + c for c in LUCENE_SPECIAL_CHARS})
+
+# C-level detector so plain text can skip the translate pass (and its copy)
+_LUCENE_SPECIAL_RE = re.compile('[' + re.escape(LUCENE_SPECIAL_CHARS) + ']')
 
 
 def lucene_escape(value: str | None) -> str:
@@ -162,17 +181,17 @@ def lucene_escape_in_place(value: str | None) -> str:
     if not requires_lucene_sanitization():
         return value
 
-    # Escape backslash first
-    escaped = value.replace('\\', '\\\\')
+    # Fast path: most text has no special characters at all
+    if _LUCENE_SPECIAL_RE.search(value) is None:
+        return value
 
-    # Escape && and || before escaping individual & and |
-    escaped = escaped.replace('&&', '\\&\\&')
-    escaped = escaped.replace('||', '\\|\\|')
+    # Escape every special character (including backslash) in a single pass
+    return value.translate(_LUCENE_ESCAPE_TABLE)
 
-    # Escape other special characters (use pre-compiled pattern)
-    escaped = LUCENE_SPECIAL_PATTERN.sub(r'\\\g<0>', escaped)
 
-    return escaped
+# Graphiti group_id validation: [a-zA-Z0-9_-]
+# A charset subset check beats a regex match for short identifiers
+_GROUP_ID_CHARS = frozenset(string.ascii_letters + string.digits + '_-')
 
 
 def sanitize_group_id(group_id: str | None) -> str:
@@ -208,10 +227,19 @@ def sanitize_group_id(group_id: str | None) -> str:
     if not requires_lucene_sanitization():
         return group_id
 
+    return _sanitize_group_id_falkordb(group_id)
+
+
+@lru_cache(maxsize=512)
+def _sanitize_group_id_falkordb(group_id: str) -> str:
+    """
+    FalkorDB group_id sanitization, memoized per group_id.
+
+    group_ids come from a small set and are sanitized on every query build,
+    so each distinct value is validated (and logged) only once.
+    """
     # Validate that group_id contains only allowed characters
-    # Graphiti validation: [a-zA-Z0-9_-]
-    valid_pattern = re.compile(r'^[a-zA-Z0-9_-]+$')
-    if not valid_pattern.match(group_id):
+    if not _GROUP_ID_CHARS.issuperset(group_id):
         logger.warning(
             f'[lucene] Invalid group_id "{group_id}" - escaping with lucene_escape()'
         )
@@ -268,12 +296,13 @@ class PatchedFalkorDriverMixin:
         See patch_falkor_driver() below.
     """
 
-    STOPWORDS = [
+    # frozenset for O(1) membership checks per query word
+    STOPWORDS = frozenset((
         'a', 'is', 'the', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by',
         'for', 'if', 'in', 'into', 'it', 'no', 'not', 'of', 'on', 'or', 'such',
         'that', 'their', 'then', 'there', 'these', 'they', 'this', 'to', 'was',
         'will', 'with',
-    ]
+    ))
 
     def build_fulltext_query_patched(
         self, query: str, group_ids: list[str] | None = None, max_query_length: int = 128
@@ -311,8 +340,11 @@ class PatchedFalkorDriverMixin:
         sanitized_query = self.sanitize(query)
 
         # Remove stopwords from the sanitized query
+        # Use the mixin's set explicitly: this method is grafted onto FalkorDriver,
+        # where self.STOPWORDS would resolve to the upstream attribute instead
+        stopwords = PatchedFalkorDriverMixin.STOPWORDS
         query_words = sanitized_query.split()
-        filtered_words = [word for word in query_words if word.lower() not in self.STOPWORDS]
+        filtered_words = [word for word in query_words if word.lower() not in stopwords]
         sanitized_query = ' | '.join(filtered_words)
 
         # If the query is too long return no query
@@ -338,7 +370,7 @@ def patch_falkor_driver() -> bool:
     build_fulltext_query method that properly sanitizes group_ids.
 
     BACKEND DETECTION: The patch is always applied (if FalkorDriver exists),
-    but sanitization functions check the database backend at runtime and only
+    but sanitization functions check the backend resolved at import and only
     apply escaping when using FalkorDB. This allows the same code to work
     with both Neo4j and FalkorDB backends.
 
@@ -422,18 +454,20 @@ def sanitize_episode_content(content: str | None, max_length: int = 10000) -> st
     if not requires_lucene_sanitization():
         return content
 
-    # Truncate if too long (RediSearch has query length limits)
-    # Avoid double concatenation
-    if len(content) > max_length:
-        content = content[:max_length - 3] + '...'
-
-    # Escape special Lucene characters in-place
-    sanitized = lucene_escape_in_place(content)
-
-    if sanitized != content:
+    # Truncate if too long (RediSearch has query length limits).
+    # Escape the truncated slice directly and append the ellipsis afterwards
+    # ('.' needs no escaping) so the body is only copied once.
+    truncated = len(content) > max_length
+    body = content[:max_length - 3] if truncated else content
+
+    # Escape special Lucene characters in-place (skipped for plain text)
+    if _LUCENE_SPECIAL_RE.search(body) is None:
+        sanitized = body
+    else:
+        sanitized = body.translate(_LUCENE_ESCAPE_TABLE)
         logger.debug(f'[lucene] Sanitized episode content (special chars escaped)')
 
-    return sanitized
+    return sanitized + '...' if truncated else sanitized
 
 
 # ============================================================================
@@ -15,16 +15,18 @@ import os
 import re
 import sys
 import time
-from collections import defaultdict
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from dotenv import load_dotenv
 from graphiti_core import Graphiti
 from graphiti_core.edges import EntityEdge
 from graphiti_core.nodes import EpisodeType, EpisodicNode
-from graphiti_core.search.search_filters import SearchFilters
+from graphiti_core.search.search_config_recipes import NODE_HYBRID_SEARCH_RRF
+from graphiti_core.search.search_filters import ComparisonOperator, DateFilter, SearchFilters
 from graphiti_core.utils.maintenance.graph_data_operations import clear_data
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel
@@ -140,10 +142,34 @@ except ImportError as e:
 # ============================================================================
 # Madeinoz Patch: Date Input Parsing for Temporal Search
 # ============================================================================
+# Duration inputs: "7d", "7 days", "7 days ago", "1w", "1 week", "1m", "1 month"
+_DURATION_RE = re.compile(r'(\d+)\s*(d|days?|w|weeks?|m|months?)(\s+ago)?')
+
+# Duration unit (first letter) -> timedelta for a count of that unit
+_DURATION_UNITS = {
+    'd': lambda num: timedelta(days=num),
+    'w': lambda num: timedelta(weeks=num),
+    'm': lambda num: timedelta(days=num * 30),  # Approximate month
+}
+
+# Fixed relative keywords -> datetime derived from the current UTC time
+_FIXED_RELATIVE = {
+    'today': lambda now: now.replace(hour=0, minute=0, second=0, microsecond=0),
+    'yesterday': lambda now: (now - timedelta(days=1)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    ),
+    'now': lambda now: now,
+}
+
+
+
 def parse_date_input(date_str: str | None) -> datetime | None:
     """
     Parse ISO 8601 or relative date strings to datetime.
 
+    ISO parses are memoized, so repeated filters in an agent session are parsed
+    once. Relative inputs are resolved against the current time on every call.
+
     Supports:
     - ISO 8601: "2026-01-26", "2026-01-26T00:00:00Z"
     - Relative: "today", "yesterday"
@@ -161,43 +187,68 @@ def parse_date_input(date_str: str | None) -> datetime | None:
     if not date_str:
         return None
 
-    # Try ISO format first
-    try:
-        # Handle ISO with or without Z suffix
-        normalized = date_str.replace('Z', '+00:00')
-        # Handle date-only format (add time)
-        if 'T' not in normalized and len(normalized) == 10:
-            normalized = f"{normalized}T00:00:00+00:00"
-        return datetime.fromisoformat(normalized)
-    except ValueError:
-        pass
+    # Try ISO format first - relative inputs never pay for a failed fromisoformat()
+    parsed = _parse_absolute_date(date_str)
+    if parsed is not None:
+        return parsed
 
     # Relative date parsing
     date_str_lower = date_str.lower().strip()
     now = datetime.now(timezone.utc)
 
-    if date_str_lower == 'today':
-        return now.replace(hour=0, minute=0, second=0, microsecond=0)
-    if date_str_lower == 'yesterday':
-        return (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-    if date_str_lower == 'now':
-        return now
+    fixed = _FIXED_RELATIVE.get(date_str_lower)
+    if fixed is not None:
+        return fixed(now)
 
     # Parse "Nd", "N days", "N days ago", "1w", "1 week", "1m", "1 month"
-    match = re.match(r'(\d+)\s*(d|days?|w|weeks?|m|months?)(\s+ago)?', date_str_lower)
+    match = _DURATION_RE.match(date_str_lower)
     if match:
-        num = int(match.group(1))
-        unit = match.group(2)[0]  # d, w, or m
-        if unit == 'd':
-            return now - timedelta(days=num)
-        elif unit == 'w':
-            return now - timedelta(weeks=num)
-        elif unit == 'm':
-            return now - timedelta(days=num * 30)  # Approximate month
+        # Unit is keyed by its first letter: d, w, or m
+        return now - _DURATION_UNITS[match.group(2)[0]](int(match.group(1)))
 
     raise ValueError(f"Cannot parse date: {date_str}")
 
 
+def _parse_absolute_date(date_str: str) -> datetime | None:
+    """Parse date_str if it is an absolute ISO 8601 date, else return None."""
+    # Only strings with a 4-digit year prefix can be ISO
+    if len(date_str) >= 7 and date_str[:4].isdigit():
+        return _parse_iso_date(date_str)
+    return None
+
+
+def _to_utc(value: datetime) -> datetime:
+    """Convert a datetime to UTC, treating naive values as already UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso_date(date_str: str) -> datetime | None:
+    """Parse an absolute ISO 8601 string, or return None if it is not one."""
+    try:
+        # Handle ISO with or without Z suffix
+        normalized = date_str.replace('Z', '+00:00')
+        # Handle date-only format (add time)
+        if 'T' not in normalized and len(normalized) == 10:
+            normalized = f"{normalized}T00:00:00+00:00"
+        return datetime.fromisoformat(normalized)
+    except ValueError:
+        return None
+
+
+# Load .env file from mcp_server directory
+# (before the Lucene patch import, which resolves the database backend once)
+mcp_server_dir = Path(__file__).parent.parent
+env_file = mcp_server_dir / '.env'
+if env_file.exists():
+    load_dotenv(env_file)
+else:
+    # Try current working directory as fallback
+    load_dotenv()
+
+
 # ============================================================================
 # Madeinoz Patch: FalkorDB Lucene Sanitization
 # ============================================================================
@@ -213,26 +264,30 @@ except ImportError:
     _lucene_patch_applied = False
 # ============================================================================
 
-# Load .env file from mcp_server directory
-mcp_server_dir = Path(__file__).parent.parent
-env_file = mcp_server_dir / '.env'
-if env_file.exists():
-    load_dotenv(env_file)
-else:
-    # Try current working directory as fallback
-    load_dotenv()
-
 
 # ============================================================================
 # SECURITY: Rate Limiting Middleware
 # ============================================================================
 
+class _ClientWindow:
+    """Per-client sliding window counter state, updated in place."""
+
+    __slots__ = ('window_start', 'current', 'previous')
+
+    def __init__(self, window_start: float):
+        self.window_start = window_start
+        self.current = 0
+        self.previous = 0
+
+
 class RateLimiter:
     """
     Simple in-memory rate limiter to prevent DoS attacks.
 
-    Uses sliding window algorithm: tracks request timestamps per client
-    and allows up to max_requests requests per time_window_seconds.
+    Uses sliding window counter algorithm: keeps the request counts of the
+    current and previous fixed windows per client, and estimates the sliding
+    window rate as previous * (1 - elapsed / window) + current. Allows up to
+    max_requests requests per time_window_seconds with O(1) state per client.
 
     SECURITY NOTE:
     - For production with multiple workers, use Redis-based rate limiting
@@ -244,6 +299,8 @@ class RateLimiter:
         max_requests: int = 60,
         time_window_seconds: int = 60,
         cleanup_interval: int = 300,
+        max_clients: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
     ):
         """
         Initialize rate limiter.
@@ -251,13 +308,18 @@ class RateLimiter:
         Args:
             max_requests: Maximum number of requests allowed per window
             time_window_seconds: Time window in seconds
-            cleanup_interval: How often to clean old entries (seconds)
+            cleanup_interval: How often cleanup_periodically() removes old entries (seconds)
+            max_clients: Maximum number of clients tracked; the least recently
+                seen client is evicted beyond this (bounds memory under IP churn)
+            clock: Monotonic time source in seconds (injectable for tests)
         """
         self.max_requests = max_requests
         self.time_window = time_window_seconds
         self.cleanup_interval = cleanup_interval
-        self.requests: dict[str, list[float]] = defaultdict(list)
-        self.last_cleanup = time.time()
+        self.max_clients = max_clients
+        self._clock = clock
+        # client_id -> window state, ordered from least to most recently seen
+        self.requests: OrderedDict[str, _ClientWindow] = OrderedDict()
 
     def is_allowed(self, client_id: str) -> bool:
         """
@@ -269,41 +331,60 @@ class RateLimiter:
         Returns:
             True if request is allowed, False if rate limit exceeded
         """
-        now = time.time()
-
-        # Periodic cleanup of old entries
-        if now - self.last_cleanup > self.cleanup_interval:
-            self._cleanup(now)
+        # Monotonic clock, so wall-clock (NTP) adjustments cannot skew windows
+        now = self._clock()
+
+        # Get window state for this client (new clients start a window now)
+        window = self.time_window
+        requests = self.requests
+        state = requests.get(client_id)
+        if state is None:
+            if len(requests) >= self.max_clients:
+                requests.popitem(last=False)
+            state = requests[client_id] = _ClientWindow(now)
+        else:
+            requests.move_to_end(client_id)
 
-        # Get recent requests from this client
-        client_requests = self.requests[client_id]
+        # Roll forward to the window containing now; the previous count only
+        # carries over if exactly one window has passed
+        elapsed = now - state.window_start
+        if elapsed >= window:
+            periods = int(elapsed // window)
+            state.previous = state.current if periods == 1 else 0
+            state.current = 0
+            state.window_start += periods * window
+            elapsed -= periods * window
 
-        # Remove requests outside the time window
-        self.requests[client_id] = [
-            req_time for req_time in client_requests
-            if now - req_time < self.time_window
-        ]
+        # Weight the previous window by its overlap with the sliding window
+        estimated = state.previous * (1 - elapsed / window) + state.current
 
         # Check if limit exceeded
-        if len(self.requests[client_id]) >= self.max_requests:
+        if estimated >= self.max_requests:
             return False
 
         # Record this request
-        self.requests[client_id].append(now)
+        state.current += 1
         return True
 
     def _cleanup(self, now: float) -> None:
-        """Remove old request timestamps from all clients."""
-        cutoff = now - self.time_window * 2  # Keep slightly more than window
-        for client_id in list(self.requests.keys()):
-            self.requests[client_id] = [
-                req_time for req_time in self.requests[client_id]
-                if req_time > cutoff
-            ]
-            # Remove empty client entries
-            if not self.requests[client_id]:
+        """Remove clients whose current and previous windows have both expired."""
+        cutoff = now - self.time_window * 2
+        for client_id, state in list(self.requests.items()):
+            if state.window_start <= cutoff:
                 del self.requests[client_id]
-        self.last_cleanup = now
+
+    async def cleanup_periodically(self) -> None:
+        """
+        Remove expired clients every cleanup_interval seconds.
+
+        Runs as a background task so is_allowed() does no housekeeping.
+        """
+        while True:
+            try:
+                await asyncio.sleep(self.cleanup_interval)
+                self._cleanup(self._clock())
+            except asyncio.CancelledError:
+                break
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
@@ -313,23 +394,28 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     Applies rate limiting to all HTTP endpoints except /health.
     """
 
+    # Paths that are never rate limited
+    SKIP_PATHS = frozenset({'/health'})
+
     def __init__(self, app, rate_limiter: RateLimiter):
         super().__init__(app)
         self.rate_limiter = rate_limiter
         self.logger = logging.getLogger(__name__)
+        # Bound once here since dispatch runs on every request
+        self._is_allowed = rate_limiter.is_allowed
 
     async def dispatch(self, request: Request, call_next):
         """Process request with rate limiting."""
         # Skip rate limiting for health checks
-        if request.url.path == '/health':
+        if request.url.path in self.SKIP_PATHS:
             return await call_next(request)
 
         # Get client IP (respect X-Forwarded-For for proxy deployments)
         client_ip = self._get_client_ip(request)
 
         # Check rate limit
-        if not self.rate_limiter.is_allowed(client_ip):
-            self.logger.warning(f'Rate limit exceeded for {client_ip}')
+        if not self._is_allowed(client_ip):
+            self.logger.warning('Rate limit exceeded for %s', client_ip)
             return JSONResponse(
                 {'error': 'Rate limit exceeded', 'retry_after': self.rate_limiter.time_window},
                 status_code=429,
@@ -347,15 +433,24 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         2. X-Real-IP header (nginx-style)
         3. Direct client address
         """
+        # Find both proxy headers in one pass over the raw ASGI headers
+        # (names are lowercase bytes) instead of one Headers scan per name
+        forwarded_for = real_ip = None
+        for name, value in request.scope['headers']:
+            if name == b'x-forwarded-for' and forwarded_for is None:
+                forwarded_for = value
+                if value:
+                    break
+            elif name == b'x-real-ip' and real_ip is None:
+                real_ip = value
+
         # Check X-Forwarded-For (may contain multiple IPs, take first)
-        forwarded_for = request.headers.get('x-forwarded-for')
         if forwarded_for:
-            return forwarded_for.split(',')[0].strip()
+            return forwarded_for.decode('latin-1').partition(',')[0].strip()
 
         # Check X-Real-IP
-        real_ip = request.headers.get('x-real-ip')
         if real_ip:
-            return real_ip
+            return real_ip.decode('latin-1')
 
         # Fall back to direct address
         if request.client:
@@ -366,6 +461,8 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
 # Global rate limiter instance (configured at startup)
 rate_limiter: Optional[RateLimiter] = None
+# Keeps the rate limiter cleanup task referenced so it isn't garbage collected
+_rate_limiter_cleanup_task: Optional[asyncio.Task] = None
 
 
 # ============================================================================
@@ -377,6 +474,34 @@ class ConfigPathError(Exception):
     pass
 
 
+def _allowed_config_bases() -> tuple[Path, ...]:
+    """
+    Allowed base directories for config files.
+
+    Built on demand rather than at import, so an unavailable home or working
+    directory only matters when a config path is actually validated.
+    In production, these should be further restricted.
+    """
+    return (
+        Path('/app/mcp/config'),              # Container default
+        Path('/app/config'),                  # Alternative container path
+        Path.cwd(),                           # Current working directory
+        Path.home() / '.config',              # User config directory
+        Path(__file__).parent.parent.parent,  # Project structure (for development)
+    )
+
+
+@lru_cache(maxsize=1)
+def _allowed_config_prefixes() -> tuple[str, ...]:
+    """
+    Resolved allowed bases with a trailing separator, computed on first use.
+
+    The separator makes containment a prefix check: '/app/config/' must not
+    match '/app/config-evil/...'.
+    """
+    return tuple(os.path.join(str(base.resolve()), '') for base in _allowed_config_bases())
+
+
 def validate_config_path(config_path: Path, allow_directories: bool = False) -> Path:
     """
     Validate that configuration file path is safe to use.
@@ -395,7 +520,7 @@ def validate_config_path(config_path: Path, allow_directories: bool = False) ->
 
     Security rules:
     - Path must be within allowed directories
-    - No parent directory traversal (..) in final path
+    - No parent directory traversal (..) in final path (guaranteed by resolve())
     - For files: must have .yaml or .yml extension
     - Path must exist
     """
@@ -405,45 +530,12 @@ def validate_config_path(config_path: Path, allow_directories: bool = False) ->
     except (FileNotFoundError, RuntimeError) as e:
         raise ConfigPathError(f'Configuration path does not exist: {config_path}') from e
 
-    # Security check: Ensure no parent directory traversal in final path
-    # This is redundant with resolve() above, but we keep it for defense in depth
-    path_str = str(resolved)
-    if '../' in path_str or '..\\' in path_str:
-        raise ConfigPathError(f'Parent directory traversal not allowed: {config_path}')
-
-    # Allowed base directories for config files
-    # In production, these should be further restricted
-    allowed_bases = [
-        Path('/app/mcp/config'),  # Container default
-        Path('/app/config'),       # Alternative container path
-        Path.cwd(),                # Current working directory
-        Path.home() / '.config',   # User config directory
-    ]
-
     # Check if path is within allowed directories
-    is_allowed = False
-    for base in allowed_bases:
-        try:
-            resolved.relative_to(base)
-            is_allowed = True
-            break
-        except ValueError:
-            # Path is not within this base directory
-            continue
-
-    if not is_allowed:
-        # Check if it's in the current project structure (for development)
-        try:
-            project_root = Path(__file__).parent.parent.parent
-            resolved.relative_to(project_root)
-            is_allowed = True
-        except ValueError:
-            pass
-
-    if not is_allowed:
+    allowed_prefixes = _allowed_config_prefixes()
+    if not os.path.join(str(resolved), '').startswith(allowed_prefixes):
         raise ConfigPathError(
             f'Configuration path must be within allowed directories: {config_path}\n'
-            f'Allowed bases: {allowed_bases}'
+            f'Allowed bases: {list(allowed_prefixes)}'
         )
 
     # For files, check extension
@@ -459,6 +551,18 @@ def validate_config_path(config_path: Path, allow_directories: bool = False) ->
 # Semaphore limit for concurrent Graphiti operations.
 SEMAPHORE_LIMIT = int(os.getenv('SEMAPHORE_LIMIT', 10))
 
+# Madeinoz Patch: Bound concurrent database operations issued by tool handlers.
+# SEMAPHORE_LIMIT only gates LLM/embedder calls; without this a burst of tool
+# calls opens unbounded concurrent queries (FalkorDB's Redis pool is unbounded)
+DB_CONCURRENCY_LIMIT = int(os.getenv('DB_CONCURRENCY_LIMIT', '20'))
+_db_semaphore = asyncio.Semaphore(DB_CONCURRENCY_LIMIT)
+
+
+async def _with_db_permit(awaitable):
+    """Await a database operation while holding a DB concurrency permit."""
+    async with _db_semaphore:
+        return await awaitable
+
 # Madeinoz Patch: Enable searching across ALL groups when no group_ids specified
 # Set to 'true' to enable, any other value (or unset) to disable
 SEARCH_ALL_GROUPS = os.getenv('GRAPHITI_SEARCH_ALL_GROUPS', 'false').lower() == 'true'
@@ -470,9 +574,11 @@ SEARCH_ALL_GROUPS = os.getenv('GRAPHITI_SEARCH_ALL_GROUPS', 'false').lower() ==
 # RATE_LIMIT_MAX_REQUESTS: Maximum requests per time window per IP
 # RATE_LIMIT_WINDOW_SECONDS: Time window in seconds
 # RATE_LIMIT_ENABLED: Set to 'false' to disable (not recommended for production)
+# RATE_LIMIT_MAX_CLIENTS: Maximum number of client IPs tracked at once
 RATE_LIMIT_MAX_REQUESTS = int(os.getenv('RATE_LIMIT_MAX_REQUESTS', '60'))
 RATE_LIMIT_WINDOW_SECONDS = int(os.getenv('RATE_LIMIT_WINDOW_SECONDS', '60'))
 RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv('RATE_LIMIT_MAX_CLIENTS', '100000'))
 
 
 # Configure structured logging with timestamps
@@ -516,44 +622,78 @@ _group_ids_cache: list[str] = []
 _group_ids_cache_time: float = 0
 _GROUP_IDS_CACHE_TTL: float = 30.0  # seconds
 
+# After a failed refresh, serve the stale cache for a short while instead of
+# re-querying a struggling database on every search
+_group_ids_retry_after: float = 0
+_GROUP_IDS_ERROR_TTL: float = 5.0  # seconds
+
+# Serializes refreshes so concurrent cache misses issue a single DB query
+_group_ids_lock = asyncio.Lock()
+
+
+def invalidate_group_ids_cache() -> None:
+    """Force the next get_all_group_ids() call to re-query the database."""
+    global _group_ids_cache_time, _group_ids_retry_after
+
+    _group_ids_cache_time = 0
+    _group_ids_retry_after = 0
+
+
+def _group_ids_cache_fresh(now: float) -> bool:
+    """Check whether the group_id cache can be served without a DB query."""
+    if _group_ids_cache and (now - _group_ids_cache_time) < _GROUP_IDS_CACHE_TTL:
+        return True
+    return now < _group_ids_retry_after
+
 
 async def get_all_group_ids(client: Graphiti) -> list[str]:
     """
     Dynamically fetch all distinct group_ids from the database.
 
     Uses a short-lived cache (30 seconds) to avoid excessive DB queries
-    while ensuring new groups are discoverable quickly.
+    while ensuring new groups are discoverable quickly. Concurrent callers
+    that miss the cache wait for a single refresh instead of each querying.
 
     Madeinoz Patch: This function enables searching across ALL groups by default.
     """
-    global _group_ids_cache, _group_ids_cache_time
-
-    current_time = time.time()
+    global _group_ids_cache, _group_ids_cache_time, _group_ids_retry_after
 
     # Return cached value if still fresh
-    if _group_ids_cache and (current_time - _group_ids_cache_time) < _GROUP_IDS_CACHE_TTL:
+    if _group_ids_cache_fresh(time.time()):
         return _group_ids_cache
 
-    try:
-        # Query for all distinct group_ids
-        async with client.driver.session() as session:
-            result = await session.run(
-                'MATCH (n) WHERE n.group_id IS NOT NULL RETURN DISTINCT n.group_id AS group_id'
-            )
-            records = [record async for record in result]
-            group_ids = [record['group_id'] for record in records if record['group_id']]
+    async with _group_ids_lock:
+        # Another coroutine may have refreshed the cache while we waited
+        current_time = time.time()
+        if _group_ids_cache_fresh(current_time):
+            return _group_ids_cache
 
-        # Update cache
-        _group_ids_cache = group_ids
-        _group_ids_cache_time = current_time
+        try:
+            # Query for all distinct group_ids. Scoped to the labels that carry
+            # group_id so the group_id range indexes created by
+            # build_indices_and_constraints() are used instead of a full scan.
+            async with _db_semaphore, client.driver.session() as session:
+                result = await session.run(
+                    'MATCH (n:Episodic) WHERE n.group_id IS NOT NULL '
+                    'RETURN DISTINCT n.group_id AS group_id '
+                    'UNION '
+                    'MATCH (n:Entity) WHERE n.group_id IS NOT NULL '
+                    'RETURN DISTINCT n.group_id AS group_id'
+                )
+                group_ids = [gid async for record in result if (gid := record['group_id'])]
 
-        logger.debug(f'Madeinoz Patch: Discovered {len(group_ids)} group_ids: {group_ids}')
-        return group_ids
+            # Update cache
+            _group_ids_cache = group_ids
+            _group_ids_cache_time = current_time
 
-    except Exception as e:
-        logger.warning(f'Madeinoz Patch: Failed to fetch group_ids, using cache: {e}')
-        # Return stale cache or empty list on error
-        return _group_ids_cache if _group_ids_cache else []
+            logger.debug(f'Madeinoz Patch: Discovered {len(group_ids)} group_ids: {group_ids}')
+            return group_ids
+
+        except Exception as e:
+            logger.warning(f'Madeinoz Patch: Failed to fetch group_ids, using cache: {e}')
+            _group_ids_retry_after = current_time + _GROUP_IDS_ERROR_TTL
+            # Return stale cache or empty list on error
+            return _group_ids_cache if _group_ids_cache else []
 
 
 async def get_effective_group_ids(
@@ -596,6 +736,116 @@ async def get_effective_group_ids(
 # ============================================================================
 
 
+# ============================================================================
+# Madeinoz Patch: Short-lived cache for repeated graph searches
+# ============================================================================
+# SEARCH_CACHE_TTL_SECONDS: How long search results are reused (0 disables, default)
+# SEARCH_CACHE_MAX_ENTRIES: Maximum number of cached searches
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv('SEARCH_CACHE_TTL_SECONDS', '0'))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', '512'))
+
+
+class _InflightSearch:
+    """Completion signal and failure for a search other callers are waiting on."""
+
+    __slots__ = ('done', 'error')
+
+    def __init__(self):
+        self.done = asyncio.Event()
+        self.error: Exception | None = None
+
+
+class SearchResultCache:
+    """
+    In-process LRU/TTL cache for raw graph search results.
+
+    Agents often re-issue identical searches within a session. Serving those
+    from memory skips the query embedding call and the hybrid search query.
+    Only the backend search is cached: filtering, scoring and metrics still
+    run per call. Concurrent misses for the same key share a single search,
+    and a failed search fails every caller waiting on it.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 0.0):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        # key -> (expiry, result), ordered from least to most recently used
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        # key -> in-flight search for that key
+        self._inflight: dict[tuple, _InflightSearch] = {}
+        # Bumped by invalidate() so searches started before a write are not stored
+        self._generation = 0
+
+    def invalidate(self) -> None:
+        """Drop all cached results after the graph has been modified."""
+        self._generation += 1
+        self._entries.clear()
+
+    async def get_or_search(self, key: tuple, search):
+        """
+        Return the cached result for key, or await search() and cache it.
+
+        Args:
+            key: Hashable search arguments
+            search: Zero-argument coroutine function performing the search
+        """
+        if self.ttl <= 0:
+            return await search()
+
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+            # Wait for an identical in-flight search, then re-check the cache
+            # (if it was invalidated or cancelled, the next waiter searches)
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            await inflight.done.wait()
+            if inflight.error is not None:
+                raise inflight.error
+
+        inflight = self._inflight[key] = _InflightSearch()
+        generation = self._generation
+        try:
+            result = await search()
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, result)
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return result
+        except Exception as e:
+            inflight.error = e
+            raise
+        finally:
+            del self._inflight[key]
+            inflight.done.set()
+
+
+_search_cache = SearchResultCache(
+    max_entries=SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=SEARCH_CACHE_TTL_SECONDS,
+)
+
+
+def _invalidate_search_cache_after(write):
+    """Wrap a graph-writing coroutine function to drop cached searches once it finishes."""
+
+    @wraps(write)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await write(*args, **kwargs)
+        finally:
+            _search_cache.invalidate()
+
+    return wrapper
+# ============================================================================
+
+
 # MCP server instructions
 GRAPHITI_MCP_INSTRUCTIONS = """
 Graphiti is a memory service for AI agents built on a knowledge graph. Graphiti performs well
@@ -647,6 +897,63 @@ _maintenance_service: Optional[Any] = None
 # Feature 017: Global queue metrics exporter reference
 _queue_metrics_exporter: Optional[Any] = None
 
+# Exception types raised when the graph database cannot be reached. Driver
+# libraries are optional per backend, so only the installed ones are matched.
+_db_connection_errors: list[type[BaseException]] = [ConnectionError]
+try:
+    from neo4j.exceptions import ServiceUnavailable
+
+    _db_connection_errors.append(ServiceUnavailable)
+except ImportError:
+    pass
+try:
+    from redis.exceptions import ConnectionError as RedisConnectionError
+
+    _db_connection_errors.append(RedisConnectionError)
+except ImportError:
+    pass
+_DB_CONNECTION_ERRORS: tuple[type[BaseException], ...] = tuple(_db_connection_errors)
+
+# Graph drivers keyed by connection settings, shared by every GraphitiService
+# pointing at the same database (e.g. the destroy_graph service and the main one)
+_graph_driver_cache: dict[tuple, Any] = {}
+
+
+def _get_graph_driver(provider: str, db_config: dict[str, Any]) -> Any:
+    """Return the graph driver for these connection settings, creating it once."""
+    if provider == 'falkordb':
+        key = (provider, db_config['host'], db_config['port'], db_config['password'], db_config['database'])
+    else:
+        key = (provider, db_config['uri'], db_config['user'], db_config['password'], db_config['database'])
+
+    driver = _graph_driver_cache.get(key)
+    if driver is not None:
+        return driver
+
+    if provider == 'falkordb':
+        from graphiti_core.driver.falkordb_driver import FalkorDriver
+
+        driver = FalkorDriver(
+            host=db_config['host'],
+            port=db_config['port'],
+            password=db_config['password'],
+            database=db_config['database'],
+        )
+    else:
+        # For Neo4j (default), build the driver explicitly so the
+        # configured database name is used for every session
+        from graphiti_core.driver.neo4j_driver import Neo4jDriver
+
+        driver = Neo4jDriver(
+            uri=db_config['uri'],
+            user=db_config['user'],
+            password=db_config['password'],
+            database=db_config['database'],
+        )
+
+    _graph_driver_cache[key] = driver
+    return driver
+
 
 class GraphitiService:
     """Graphiti service using the unified configuration system."""
@@ -735,35 +1042,18 @@ class GraphitiService:
 
             # Initialize Graphiti client with appropriate driver
             try:
-                if self.config.database.provider.lower() == 'falkordb':
-                    from graphiti_core.driver.falkordb_driver import FalkorDriver
-
-                    falkor_driver = FalkorDriver(
-                        host=db_config['host'],
-                        port=db_config['port'],
-                        password=db_config['password'],
-                        database=db_config['database'],
-                    )
+                graph_driver = _get_graph_driver(
+                    self.config.database.provider.lower(), db_config
+                )
 
-                    self.client = Graphiti(
-                        graph_driver=falkor_driver,
-                        llm_client=llm_client,
-                        embedder=embedder_client,
-                        max_coroutines=self.semaphore_limit,
-                    )
-                else:
-                    # For Neo4j (default), use the original approach
-                    self.client = Graphiti(
-                        uri=db_config['uri'],
-                        user=db_config['user'],
-                        password=db_config['password'],
-                        llm_client=llm_client,
-                        embedder=embedder_client,
-                        max_coroutines=self.semaphore_limit,
-                    )
+                self.client = Graphiti(
+                    graph_driver=graph_driver,
+                    llm_client=llm_client,
+                    embedder=embedder_client,
+                    max_coroutines=self.semaphore_limit,
+                )
             except Exception as db_error:
-                error_msg = str(db_error).lower()
-                if 'connection refused' in error_msg or 'could not connect' in error_msg:
+                if isinstance(db_error, _DB_CONNECTION_ERRORS):
                     db_provider = self.config.database.provider
                     if db_provider.lower() == 'falkordb':
                         raise RuntimeError(
@@ -881,7 +1171,9 @@ class GraphitiService:
                         logger.info(f"Feature 009: Initial health metrics calculated - {total_memories} memories, dashboard counts updated")
 
                         # Feature 009: Start scheduled maintenance if configured
-                        await maintenance.start_scheduled_maintenance()
+                        await maintenance.start_scheduled_maintenance(
+                            on_run_complete=_search_cache.invalidate
+                        )
                     except Exception as health_err:
                         logger.warning(f'Feature 009: Initial health metrics calculation failed (non-critical): {health_err}')
 
@@ -919,6 +1211,10 @@ class GraphitiService:
         return {"entity_types": [], "relationship_types": []}
 
 
+# Valid add_memory sources, keyed by their lowercase name
+_EPISODE_TYPE_MAP: dict[str, EpisodeType] = {t.name: t for t in EpisodeType}
+
+
 @mcp.tool()
 async def add_memory(
     name: str,
@@ -950,12 +1246,13 @@ async def add_memory(
         # Use the provided group_id or fall back to the default from config
         effective_group_id = group_id or config.graphiti.group_id
 
-        # Try to parse the source as an EpisodeType enum, with fallback to text
+        # Map the source to an EpisodeType enum, with fallback to text
         episode_type = EpisodeType.text
         if source:
-            try:
-                episode_type = EpisodeType[source.lower()]
-            except (KeyError, AttributeError):
+            episode_type = _EPISODE_TYPE_MAP.get(source)
+            if episode_type is None:
+                episode_type = _EPISODE_TYPE_MAP.get(source.lower())
+            if episode_type is None:
                 logger.warning(f"Unknown source type '{source}'. Valid types: text, json, message. Use source_description for custom identifiers.")
                 episode_type = EpisodeType.text
 
@@ -1003,7 +1300,7 @@ async def add_memory(
         # Feature 011: Spawn immediate background classification for unclassified nodes
         try:
             client = await graphiti_service.get_client()
-            asyncio.create_task(
+            classify_task = asyncio.create_task(
                 classify_unclassified_nodes(
                     driver=client.driver,
                     llm_client=graphiti_service.llm_client,
@@ -1011,6 +1308,8 @@ async def add_memory(
                     max_nodes=100,
                 )
             )
+            # Classification writes importance/stability read by node searches
+            classify_task.add_done_callback(lambda _: _search_cache.invalidate())
             logger.info(f"Spawned immediate background classification for episode '{name}'")
         except Exception as classify_err:
             logger.warning(f"Failed to spawn background classification: {classify_err}")
@@ -1054,7 +1353,6 @@ async def search_nodes(
         return ErrorResponse(error='Graphiti service not initialized')
 
     # Feature 009: Track search metrics
-    import time
     search_start = time.time()
 
     try:
@@ -1075,18 +1373,34 @@ async def search_nodes(
             node_labels=entity_types,
         )
 
-        # Use the search_ method with node search config
-        from graphiti_core.search.search_config_recipes import NODE_HYBRID_SEARCH_RRF
-
         # If temporal filtering or weighted scoring is needed, fetch more results
         fetch_limit = max_nodes * 3 if (has_temporal_filter or include_weighted_scores) else max_nodes
-
-        results = await client.search_(
-            query=query,
-            config=NODE_HYBRID_SEARCH_RRF,
-            group_ids=effective_group_ids,
-            search_filter=search_filters,
-        )
+        # The recipe's own limit is fixed, so apply ours to a copy
+        search_config = NODE_HYBRID_SEARCH_RRF.model_copy(update={'limit': fetch_limit})
+
+        def search():
+            return _with_db_permit(client.search_(
+                query=query,
+                config=search_config,
+                group_ids=effective_group_ids,
+                search_filter=search_filters,
+            ))
+
+        if exclude_lifecycle_states or include_weighted_scores:
+            # Lifecycle state and decay attributes change outside the write
+            # paths that invalidate the cache, so always read them fresh
+            results = await search()
+        else:
+            results = await _search_cache.get_or_search(
+                (
+                    'nodes',
+                    query,
+                    tuple(sorted(effective_group_ids)),
+                    tuple(sorted(entity_types)) if entity_types else None,
+                    fetch_limit,
+                ),
+                search,
+            )
 
         # Extract nodes from results
         nodes = results.nodes if results.nodes else []
@@ -1331,7 +1645,6 @@ async def search_memory_facts(
         return ErrorResponse(error='Graphiti service not initialized')
 
     # Feature 009: Track search metrics
-    import time
     search_start = time.time()
 
     try:
@@ -1356,15 +1669,55 @@ async def search_memory_facts(
             relationship_types_set = set(relationship_types)
             logger.debug(f'Feature 018: Filtering by relationship types: {relationship_types}')
 
-        # If temporal or relationship filtering is needed, fetch more results to filter
-        fetch_limit = max_facts * 3 if (has_temporal_filter or has_relationship_filter) else max_facts
-
-        relevant_edges = await client.search(
-            group_ids=effective_group_ids,
-            query=query,
-            num_results=fetch_limit,
-            center_node_uuid=center_node_uuid,
-        )
+        # Madeinoz Patch: Push the temporal filter into the edge search query so
+        # the database prunes by created_at (inner list is ANDed). Bounds are
+        # sent in UTC like the stored values: FalkorDB compares them as ISO
+        # strings, and Neo4j never matches naive (LocalDateTime) bounds.
+        search_filters = None
+        if has_temporal_filter:
+            date_filters = []
+            if after_date:
+                date_filters.append(
+                    DateFilter(date=_to_utc(after_date), comparison_operator=ComparisonOperator.greater_than_equal)
+                )
+            if before_date:
+                date_filters.append(
+                    DateFilter(date=_to_utc(before_date), comparison_operator=ComparisonOperator.less_than_equal)
+                )
+            search_filters = SearchFilters(created_at=[date_filters])
+
+        # If relationship filtering is needed, fetch more results to filter
+        fetch_limit = max_facts * 3 if has_relationship_filter else max_facts
+
+        def search():
+            return _with_db_permit(client.search(
+                group_ids=effective_group_ids,
+                query=query,
+                num_results=fetch_limit,
+                center_node_uuid=center_node_uuid,
+                search_filter=search_filters,
+            ))
+
+        # Relative bounds ("7d", "now") resolve to a new instant on every call,
+        # so they would never hit and only evict useful entries
+        if any(
+            bound and _parse_absolute_date(bound) is None
+            for bound in (created_after, created_before)
+        ):
+            relevant_edges = await search()
+        else:
+            relevant_edges = await _search_cache.get_or_search(
+                (
+                    'facts',
+                    query,
+                    tuple(sorted(effective_group_ids)),
+                    fetch_limit,
+                    center_node_uuid,
+                    after_date,
+                    before_date,
+                ),
+                search,
+            )
 
         if not relevant_edges:
             # Feature 009: Record zero-result search metrics
@@ -1382,26 +1735,6 @@ async def search_memory_facts(
                     logger.debug(f'Failed to record search metrics: {metrics_err}')
             return FactSearchResponse(message='No relevant facts found', facts=[])
 
-        # Madeinoz Patch: Apply temporal filtering if specified
-        if has_temporal_filter:
-            filtered_edges = []
-            for edge in relevant_edges:
-                if edge.created_at is None:
-                    continue  # Skip edges without creation date
-                edge_date = edge.created_at
-                # Make sure edge_date is timezone-aware for comparison
-                if edge_date.tzinfo is None:
-                    edge_date = edge_date.replace(tzinfo=timezone.utc)
-                # Apply after filter
-                if after_date and edge_date < after_date:
-                    continue
-                # Apply before filter
-                if before_date and edge_date > before_date:
-                    continue
-                filtered_edges.append(edge)
-            relevant_edges = filtered_edges
-            logger.debug(f'Madeinoz Patch: Temporal filter applied, {len(relevant_edges)} facts remaining')
-
         # Feature 018 T044: Apply relationship type filtering if specified
         if has_relationship_filter:
             filtered_edges = []
@@ -1483,8 +1816,10 @@ async def delete_entity_edge(uuid: str) -> SuccessResponse | ErrorResponse:
 
     try:
         client = await graphiti_service.get_client()
-        entity_edge = await EntityEdge.get_by_uuid(client.driver, uuid)
-        await entity_edge.delete(client.driver)
+        async with _db_semaphore:
+            entity_edge = await EntityEdge.get_by_uuid(client.driver, uuid)
+            await entity_edge.delete(client.driver)
+        _search_cache.invalidate()
         return SuccessResponse(message=f'Entity edge with UUID {uuid} deleted successfully')
     except Exception as e:
         error_msg = str(e)
@@ -1506,8 +1841,10 @@ async def delete_episode(uuid: str) -> SuccessResponse | ErrorResponse:
 
     try:
         client = await graphiti_service.get_client()
-        episodic_node = await EpisodicNode.get_by_uuid(client.driver, uuid)
-        await episodic_node.delete(client.driver)
+        async with _db_semaphore:
+            episodic_node = await EpisodicNode.get_by_uuid(client.driver, uuid)
+            await episodic_node.delete(client.driver)
+        _search_cache.invalidate()
         return SuccessResponse(message=f'Episode with UUID {uuid} deleted successfully')
     except Exception as e:
         error_msg = str(e)
@@ -1515,6 +1852,83 @@ async def delete_episode(uuid: str) -> SuccessResponse | ErrorResponse:
         return ErrorResponse(error=f'Error deleting episode: {error_msg}')
 
 
+# Madeinoz Patch: Bulk deletes run as a single query (one round-trip and one
+# transaction) instead of a fetch + delete round-trip pair per UUID
+DELETE_ENTITY_EDGES_QUERY = """
+MATCH ()-[e:RELATES_TO]->()
+WHERE e.uuid IN $uuids
+DELETE e
+RETURN count(*) AS deleted
+"""
+
+DELETE_EPISODES_QUERY = """
+MATCH (n:Episodic)
+WHERE n.uuid IN $uuids
+DETACH DELETE n
+RETURN count(*) AS deleted
+"""
+
+
+@mcp.tool()
+async def delete_entity_edges(uuids: list[str]) -> SuccessResponse | ErrorResponse:
+    """Delete multiple entity edges from the graph memory in one operation.
+
+    Args:
+        uuids: UUIDs of the entity edges to delete
+    """
+    global graphiti_service
+
+    if graphiti_service is None:
+        return ErrorResponse(error='Graphiti service not initialized')
+
+    if not uuids:
+        return ErrorResponse(error='No UUIDs specified for deletion')
+
+    try:
+        client = await graphiti_service.get_client()
+        # execute_query returns the records on both Neo4j and FalkorDB
+        # (FalkorDB sessions return no result object from run())
+        async with _db_semaphore:
+            records, _, _ = await client.driver.execute_query(DELETE_ENTITY_EDGES_QUERY, uuids=uuids)
+        deleted = records[0]['deleted'] if records else 0
+        _search_cache.invalidate()
+        return SuccessResponse(message=f'Deleted {deleted} of {len(uuids)} entity edges')
+    except Exception as e:
+        error_msg = str(e)
+        logger.error(f'Error deleting entity edges: {error_msg}')
+        return ErrorResponse(error=f'Error deleting entity edges: {error_msg}')
+
+
+@mcp.tool()
+async def delete_episodes(uuids: list[str]) -> SuccessResponse | ErrorResponse:
+    """Delete multiple episodes from the graph memory in one operation.
+
+    Args:
+        uuids: UUIDs of the episodes to delete
+    """
+    global graphiti_service
+
+    if graphiti_service is None:
+        return ErrorResponse(error='Graphiti service not initialized')
+
+    if not uuids:
+        return ErrorResponse(error='No UUIDs specified for deletion')
+
+    try:
+        client = await graphiti_service.get_client()
+        # execute_query returns the records on both Neo4j and FalkorDB
+        # (FalkorDB sessions return no result object from run())
+        async with _db_semaphore:
+            records, _, _ = await client.driver.execute_query(DELETE_EPISODES_QUERY, uuids=uuids)
+        deleted = records[0]['deleted'] if records else 0
+        _search_cache.invalidate()
+        return SuccessResponse(message=f'Deleted {deleted} of {len(uuids)} episodes')
+    except Exception as e:
+        error_msg = str(e)
+        logger.error(f'Error deleting episodes: {error_msg}')
+        return ErrorResponse(error=f'Error deleting episodes: {error_msg}')
+
+
 @mcp.tool()
 async def get_entity_edge(uuid: str) -> dict[str, Any] | ErrorResponse:
     """Get an entity edge from the graph memory by its UUID.
@@ -1529,7 +1943,7 @@ async def get_entity_edge(uuid: str) -> dict[str, Any] | ErrorResponse:
 
     try:
         client = await graphiti_service.get_client()
-        entity_edge = await EntityEdge.get_by_uuid(client.driver, uuid)
+        entity_edge = await _with_db_permit(EntityEdge.get_by_uuid(client.driver, uuid))
         return format_fact_result(entity_edge)
     except Exception as e:
         error_msg = str(e)
@@ -1537,6 +1951,20 @@ async def get_entity_edge(uuid: str) -> dict[str, Any] | ErrorResponse:
         return ErrorResponse(error=f'Error getting entity edge: {error_msg}')
 
 
+def _format_episode(episode: EpisodicNode) -> dict[str, Any]:
+    """Convert an EpisodicNode into the get_episodes response dict."""
+    source = episode.source
+    return {
+        'uuid': episode.uuid,
+        'name': episode.name,
+        'content': episode.content,
+        'created_at': episode.created_at.isoformat() if episode.created_at else None,
+        'source': source.value if isinstance(source, EpisodeType) else str(source),
+        'source_description': episode.source_description,
+        'group_id': episode.group_id,
+    }
+
+
 @mcp.tool()
 async def get_episodes(
     group_ids: list[str] | None = None,
@@ -1561,12 +1989,10 @@ async def get_episodes(
             client, group_ids, config.graphiti.group_id
         )
 
-        from graphiti_core.nodes import EpisodicNode
-
         if effective_group_ids:
-            episodes = await EpisodicNode.get_by_group_ids(
+            episodes = await _with_db_permit(EpisodicNode.get_by_group_ids(
                 client.driver, effective_group_ids, limit=max_episodes
-            )
+            ))
         else:
             episodes = []
 
@@ -1574,20 +2000,7 @@ async def get_episodes(
             return EpisodeSearchResponse(message='No episodes found', episodes=[])
 
         # Format the results
-        episode_results = []
-        for episode in episodes:
-            episode_dict = {
-                'uuid': episode.uuid,
-                'name': episode.name,
-                'content': episode.content,
-                'created_at': episode.created_at.isoformat() if episode.created_at else None,
-                'source': episode.source.value
-                if hasattr(episode.source, 'value')
-                else str(episode.source),
-                'source_description': episode.source_description,
-                'group_id': episode.group_id,
-            }
-            episode_results.append(episode_dict)
+        episode_results = [_format_episode(episode) for episode in episodes]
 
         return EpisodeSearchResponse(
             message='Episodes retrieved successfully', episodes=episode_results
@@ -1622,7 +2035,10 @@ async def clear_graph(group_ids: list[str] | None = None) -> SuccessResponse | E
         if not effective_group_ids:
             return ErrorResponse(error='No group IDs specified for clearing')
 
-        await clear_data(client.driver, group_ids=effective_group_ids)
+        await _with_db_permit(clear_data(client.driver, group_ids=effective_group_ids))
+        _search_cache.invalidate()
+        # The cleared groups must stop being searched by default
+        invalidate_group_ids_cache()
 
         return SuccessResponse(
             message=f'Graph data cleared successfully for group IDs: {", ".join(effective_group_ids)}'
@@ -1644,8 +2060,9 @@ async def get_status() -> StatusResponse:
     try:
         client = await graphiti_service.get_client()
 
-        async with client.driver.session() as session:
-            result = await session.run('MATCH (n) RETURN count(n) as count')
+        # Constant-time round-trip; proves connectivity without scanning nodes
+        async with _db_semaphore, client.driver.session() as session:
+            result = await session.run('RETURN 1 AS ok')
             if result:
                 _ = [record async for record in result]
 
@@ -1718,13 +2135,11 @@ async def investigate_entity(
         )
 
         # First, search for the entity by name
-        from graphiti_core.search.search_config_recipes import NODE_HYBRID_SEARCH_RRF
-
-        search_results = await client.search_(
+        search_results = await _with_db_permit(client.search_(
             query=entity_name,
             config=NODE_HYBRID_SEARCH_RRF,
             group_ids=effective_group_ids,
-        )
+        ))
 
         # Extract the best matching entity
         nodes = search_results.nodes if search_results.nodes else []
@@ -1895,8 +2310,6 @@ async def health_decay_check(request) -> JSONResponse:
 
     Per contracts/decay-api.yaml DecayHealthCheck schema.
     """
-    import time
-
     global graphiti_service, _server_start_time
 
     # Default response for degraded state
@@ -1977,6 +2390,9 @@ async def run_decay_maintenance(
         client = await graphiti_service.get_client()
         maintenance = get_maintenance_service(client.driver, llm_client=graphiti_service.llm_client)
         result = await maintenance.run_maintenance(dry_run=dry_run)
+        if not dry_run:
+            # Lifecycle states and decay scores changed under cached searches
+            _search_cache.invalidate()
         return result.to_dict()
     except Exception as e:
         error_msg = str(e)
@@ -2049,6 +2465,7 @@ async def recover_soft_deleted(
             return ErrorResponse(
                 error=f'Memory {uuid} not found, not soft-deleted, or past retention window'
             )
+        _search_cache.invalidate()
 
         return {
             'message': f"Memory '{result['name']}' recovered successfully",
@@ -2167,6 +2584,8 @@ if _stix_importer_available:
                 group_id=group_id
             )
 
+            _search_cache.invalidate()
+
             # Add source file info to result
             result['source_file'] = bundle_path
 
@@ -2276,6 +2695,7 @@ if _stix_importer_available:
                 batch_size=1000,
                 group_id=group_id
             )
+            _search_cache.invalidate()
 
             return result
 
@@ -2422,6 +2842,10 @@ async def initialize_server() -> ServerConfig:
     graphiti_client = await graphiti_service.get_client()
     semaphore = graphiti_service.semaphore
 
+    # Queued episodes are written by the queue worker; drop cached searches
+    # once each one has actually been added to the graph
+    graphiti_client.add_episode = _invalidate_search_cache_after(graphiti_client.add_episode)
+
     await queue_service.initialize(graphiti_client)
 
     if config.server.host:
@@ -2452,7 +2876,6 @@ async def _update_consumer_metrics_periodically():
             # Calculate consumer health metrics
             # Note: In a real implementation, these would be calculated from
             # actual queue state. For now, we use simple defaults.
-            import time
             current_time = time.time()
 
             # Get queue depth (default queue)
@@ -2482,7 +2905,7 @@ async def _update_consumer_metrics_periodically():
 
 async def run_mcp_server():
     """Run the MCP server in the current event loop."""
-    global rate_limiter
+    global rate_limiter, _rate_limiter_cleanup_task
 
     mcp_config = await initialize_server()
 
@@ -2495,7 +2918,9 @@ async def run_mcp_server():
         rate_limiter = RateLimiter(
             max_requests=RATE_LIMIT_MAX_REQUESTS,
             time_window_seconds=RATE_LIMIT_WINDOW_SECONDS,
+            max_clients=RATE_LIMIT_MAX_CLIENTS,
         )
+        _rate_limiter_cleanup_task = asyncio.create_task(rate_limiter.cleanup_periodically())
         logger.info(
             f'Rate limiting enabled: {RATE_LIMIT_MAX_REQUESTS} requests per {RATE_LIMIT_WINDOW_SECONDS} seconds'
         )
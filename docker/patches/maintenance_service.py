@@ -20,7 +20,7 @@ import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Any
+from typing import Any, Callable, Optional
 
 from utils.decay_config import get_decay_config
 from utils.decay_types import LifecycleState
@@ -652,12 +652,19 @@ class MaintenanceService:
         if result.soft_deleted_purged > 0:
             decay_metrics.record_memories_purged(result.soft_deleted_purged)
 
-    async def start_scheduled_maintenance(self) -> None:
+    async def start_scheduled_maintenance(
+        self,
+        on_run_complete: Optional[Callable[[], None]] = None
+    ) -> None:
         """
         Start the automatic maintenance scheduler.
 
         Runs maintenance every schedule_interval_hours until shutdown.
         Use stop_scheduled_maintenance() or shutdown_event to stop gracefully.
+
+        Args:
+            on_run_complete: Optional callback invoked after every scheduled run,
+                successful or not (a failed run may still have modified nodes)
         """
         if self.schedule_interval_hours <= 0:
             logger.info(f"Scheduled maintenance disabled (schedule_interval_hours={self.schedule_interval_hours})")
@@ -693,6 +700,9 @@ class MaintenanceService:
                             logger.error(f"Scheduled maintenance failed: {result.error}")
                     except Exception as e:
                         logger.error(f"Error in scheduled maintenance: {e}")
+                    finally:
+                        if on_run_complete is not None:
+                            on_run_complete()
 
                     # Wait for next interval or shutdown
                     try:
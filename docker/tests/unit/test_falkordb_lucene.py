@@ -0,0 +1,202 @@
+"""
+Unit Tests for FalkorDB Lucene Sanitization
+
+Tests verify that:
+1. lucene_escape_in_place escapes every special character in a single pass
+2. Two-character operators (&& and ||) are escaped as individual characters
+3. Neo4j backend bypasses escaping entirely
+4. The backend decision is cached and only re-read on _refresh_backend()
+"""
+
+import pytest
+import sys
+import os
+
+# Add patches directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'patches'))
+
+
+def _select_backend(monkeypatch, backend):
+    """Switch the backend and re-resolve the module's cached decision."""
+    import falkordb_lucene
+
+    monkeypatch.delenv('DATABASE_TYPE', raising=False)
+    monkeypatch.setenv('MADEINOZ_KNOWLEDGE_DATABASE_TYPE', backend)
+    falkordb_lucene._refresh_backend()
+
+
+@pytest.fixture
+def falkordb_backend(monkeypatch):
+    """Select the FalkorDB backend for the duration of a test."""
+    _select_backend(monkeypatch, 'falkordb')
+    yield
+    monkeypatch.undo()
+    import falkordb_lucene
+    falkordb_lucene._refresh_backend()
+
+
+@pytest.fixture
+def neo4j_backend(monkeypatch):
+    """Select the Neo4j backend for the duration of a test."""
+    _select_backend(monkeypatch, 'neo4j')
+    yield
+    monkeypatch.undo()
+    import falkordb_lucene
+    falkordb_lucene._refresh_backend()
+
+
+class TestLuceneEscapeInPlace:
+    """Test in-place escaping of Lucene special characters."""
+
+    def test_escapes_hyphens(self, falkordb_backend):
+        """Hyphens should be escaped with a single backslash."""
+        from falkordb_lucene import lucene_escape_in_place
+
+        assert lucene_escape_in_place('madeinoz-threat-intel') == 'madeinoz\\-threat\\-intel'
+
+    def test_escapes_double_operators_per_character(self, falkordb_backend):
+        """&& and || should escape each character exactly once."""
+        from falkordb_lucene import lucene_escape_in_place
+
+        assert lucene_escape_in_place('A || B') == 'A \\|\\| B'
+        assert lucene_escape_in_place('A && B') == 'A \\&\\& B'
+
+    def test_escapes_backslash(self, falkordb_backend):
+        """Backslashes should be doubled, not re-escaped."""
+        from falkordb_lucene import lucene_escape_in_place
+
+        assert lucene_escape_in_place('a\\b') == 'a\\\\b'
+
+    def test_escapes_all_special_characters(self, falkordb_backend):
+        """Every special character should be prefixed with a backslash."""
+        from falkordb_lucene import LUCENE_SPECIAL_CHARS, lucene_escape_in_place
+
+        escaped = lucene_escape_in_place(LUCENE_SPECIAL_CHARS)
+
+        assert escaped == ''.join('\\' + c for c in LUCENE_SPECIAL_CHARS)
+
+    def test_plain_text_unchanged(self, falkordb_backend):
+        """Text without special characters should be returned as the same object."""
+        from falkordb_lucene import lucene_escape_in_place
+
+        text = 'APT28 is a threat group'
+
+        assert lucene_escape_in_place(text) is text
+
+    def test_none_and_empty(self, falkordb_backend):
+        """None should become an empty string and empty stays empty."""
+        from falkordb_lucene import lucene_escape_in_place
+
+        assert lucene_escape_in_place(None) == ''
+        assert lucene_escape_in_place('') == ''
+
+    def test_neo4j_backend_bypasses_escaping(self, neo4j_backend):
+        """Neo4j backend should return the value unchanged."""
+        from falkordb_lucene import lucene_escape_in_place
+
+        assert lucene_escape_in_place('A || B') == 'A || B'
+
+
+class TestSanitizeGroupId:
+    """Test group_id sanitization."""
+
+    def test_converts_hyphens_to_underscores(self, falkordb_backend):
+        """Hyphens should become underscores on FalkorDB."""
+        from falkordb_lucene import sanitize_group_id
+
+        assert sanitize_group_id('madeinoz-threat-intel') == 'madeinoz_threat_intel'
+
+    def test_invalid_group_id_is_escaped(self, falkordb_backend):
+        """group_ids outside [a-zA-Z0-9_-] should be escaped, not passed through."""
+        from falkordb_lucene import sanitize_group_id
+
+        assert sanitize_group_id('bad"id') == 'bad\\"id'
+
+    def test_repeated_calls_hit_cache(self, falkordb_backend):
+        """Sanitizing the same group_id again should be served from the cache."""
+        from falkordb_lucene import _sanitize_group_id_falkordb, sanitize_group_id
+
+        sanitize_group_id('cache-probe')
+        hits_before = _sanitize_group_id_falkordb.cache_info().hits
+        sanitize_group_id('cache-probe')
+
+        assert _sanitize_group_id_falkordb.cache_info().hits == hits_before + 1
+
+    def test_none_and_empty(self, falkordb_backend):
+        """None and empty values should pass through."""
+        from falkordb_lucene import sanitize_group_id
+
+        assert sanitize_group_id(None) is None
+        assert sanitize_group_id('') == ''
+
+    def test_neo4j_backend_returns_original(self, neo4j_backend):
+        """Neo4j backend should return the group_id unchanged."""
+        from falkordb_lucene import sanitize_group_id
+
+        assert sanitize_group_id('madeinoz-threat-intel') == 'madeinoz-threat-intel'
+
+
+class TestSanitizeEpisodeContent:
+    """Test episode content sanitization."""
+
+    def test_escapes_content(self, falkordb_backend):
+        """Special characters in episode bodies should be escaped."""
+        from falkordb_lucene import sanitize_episode_content
+
+        assert sanitize_episode_content('APT-28 is a threat group') == 'APT\\-28 is a threat group'
+
+    def test_truncates_long_content(self, falkordb_backend):
+        """Content longer than max_length should be truncated with an ellipsis."""
+        from falkordb_lucene import sanitize_episode_content
+
+        result = sanitize_episode_content('x' * 50, max_length=20)
+
+        assert result == 'x' * 17 + '...'
+
+    def test_truncates_before_escaping(self, falkordb_backend):
+        """max_length applies to the raw content; escapes are added after the cut."""
+        from falkordb_lucene import sanitize_episode_content
+
+        result = sanitize_episode_content('a-b-' * 10, max_length=7)
+
+        assert result == 'a\\-b\\-...'
+
+    def test_neo4j_backend_returns_original(self, neo4j_backend):
+        """Neo4j backend should return the content unchanged."""
+        from falkordb_lucene import sanitize_episode_content
+
+        assert sanitize_episode_content('APT-28 | test') == 'APT-28 | test'
+
+
+class TestBackendDetection:
+    """Test the cached backend decision."""
+
+    def test_decision_cached_until_refresh(self, falkordb_backend, monkeypatch):
+        """Changing the environment should not flip the decision until refreshed."""
+        import falkordb_lucene
+
+        monkeypatch.setenv('MADEINOZ_KNOWLEDGE_DATABASE_TYPE', 'neo4j')
+        assert falkordb_lucene.requires_lucene_sanitization() is True
+
+        falkordb_lucene._refresh_backend()
+        assert falkordb_lucene.requires_lucene_sanitization() is False
+
+
+class TestBuildFulltextQuery:
+    """Test the patched fulltext query builder."""
+
+    class _Driver:
+        """Minimal stand-in for FalkorDriver (no STOPWORDS of its own)."""
+
+        def sanitize(self, query):
+            return query
+
+    def test_removes_stopwords_and_sanitizes_group_ids(self, falkordb_backend):
+        """Stopwords should be dropped and group_ids sanitized."""
+        from falkordb_lucene import PatchedFalkorDriverMixin
+
+        query = PatchedFalkorDriverMixin.build_fulltext_query_patched(
+            self._Driver(), 'The APT and the malware', group_ids=['threat-intel']
+        )
+
+        assert query == '(@group_id:threat_intel) (APT | malware)'
@@ -0,0 +1,499 @@
+"""
+Unit Tests for MCP Server Helpers
+
+Tests verify that:
+1. RateLimiter applies the sliding window counter across window rollover
+2. RateLimiter evicts the least recently seen client and cleans up expired ones
+3. SearchResultCache coalesces concurrent searches, shares failures and
+   honours invalidation
+4. parse_date_input accepts every ISO form fromisoformat does and resolves
+   relative dates against the current time
+5. validate_config_path only accepts YAML files inside the allowed bases
+6. The bulk delete tools report counts and invalidate the search cache
+"""
+
+import asyncio
+import importlib
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Add patches directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'patches'))
+
+# Third-party and sibling modules the server imports at load time
+STUBBED_MODULES = (
+    'dotenv',
+    'graphiti_core',
+    'graphiti_core.edges',
+    'graphiti_core.nodes',
+    'graphiti_core.search',
+    'graphiti_core.search.search_config_recipes',
+    'graphiti_core.search.search_filters',
+    'graphiti_core.utils',
+    'graphiti_core.utils.maintenance',
+    'graphiti_core.utils.maintenance.graph_data_operations',
+    'mcp',
+    'mcp.server',
+    'mcp.server.fastmcp',
+    'starlette',
+    'starlette.middleware',
+    'starlette.middleware.base',
+    'starlette.requests',
+    'starlette.responses',
+    'config',
+    'config.schema',
+    'models',
+    'models.response_types',
+    'services',
+    'services.factories',
+    'services.queue_service',
+    'utils.formatting',
+)
+
+
+class _EpisodeType(Enum):
+    """Stand-in for graphiti_core.nodes.EpisodeType (iterated at import)."""
+
+    message = 'message'
+    json = 'json'
+    text = 'text'
+
+
+class _BaseHTTPMiddleware:
+    """Stand-in for starlette's BaseHTTPMiddleware (subclassed at import)."""
+
+    def __init__(self, app, dispatch=None):
+        self.app = app
+
+
+@pytest.fixture(scope='module')
+def server():
+    """Import graphiti_mcp_server with its heavy dependencies stubbed out."""
+    stubs = {name: MagicMock() for name in STUBBED_MODULES}
+    stubs['graphiti_core.nodes'].EpisodeType = _EpisodeType
+    stubs['starlette.middleware.base'].BaseHTTPMiddleware = _BaseHTTPMiddleware
+    # Keep tool functions callable instead of replacing them with mocks
+    stubs['mcp.server.fastmcp'].FastMCP.return_value.tool.return_value = lambda fn: fn
+    # Response types are TypedDicts upstream, so calling them builds a dict
+    stubs['models.response_types'].SuccessResponse = dict
+    stubs['models.response_types'].ErrorResponse = dict
+
+    with patch.dict(sys.modules, stubs):
+        sys.modules.pop('graphiti_mcp_server', None)
+        yield importlib.import_module('graphiti_mcp_server')
+
+
+class _Clock:
+    """Controllable monotonic clock injected into RateLimiter."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """A fresh controllable clock for each test."""
+    return _Clock()
+
+
+class TestRateLimiter:
+    """Test the sliding window counter rate limiter."""
+
+    def test_allows_up_to_max_requests(self, server, clock):
+        """Requests beyond max_requests within one window should be rejected."""
+        limiter = server.RateLimiter(max_requests=3, time_window_seconds=60, clock=clock)
+
+        assert [limiter.is_allowed('a') for _ in range(4)] == [True, True, True, False]
+
+    def test_clients_are_limited_independently(self, server, clock):
+        """One client exhausting its limit should not affect another."""
+        limiter = server.RateLimiter(max_requests=1, time_window_seconds=60, clock=clock)
+
+        assert limiter.is_allowed('a') is True
+        assert limiter.is_allowed('a') is False
+        assert limiter.is_allowed('b') is True
+
+    def test_rollover_weights_previous_window(self, server, clock):
+        """Halfway into the next window, half of the previous count still applies."""
+        limiter = server.RateLimiter(max_requests=10, time_window_seconds=60, clock=clock)
+        for _ in range(10):
+            assert limiter.is_allowed('a') is True
+
+        clock.now += 90  # 30s into the next window
+
+        allowed = sum(limiter.is_allowed('a') for _ in range(10))
+
+        assert allowed == 5
+
+    def test_idle_client_starts_from_zero(self, server, clock):
+        """After two full windows without requests the previous count is dropped."""
+        limiter = server.RateLimiter(max_requests=10, time_window_seconds=60, clock=clock)
+        for _ in range(10):
+            limiter.is_allowed('a')
+
+        clock.now += 150
+
+        assert sum(limiter.is_allowed('a') for _ in range(10)) == 10
+
+    def test_evicts_least_recently_seen_client(self, server, clock):
+        """Beyond max_clients the least recently seen client should be dropped."""
+        limiter = server.RateLimiter(max_requests=5, time_window_seconds=60, max_clients=2, clock=clock)
+
+        limiter.is_allowed('a')
+        limiter.is_allowed('b')
+        limiter.is_allowed('a')
+        limiter.is_allowed('c')
+
+        assert list(limiter.requests) == ['a', 'c']
+
+    def test_cleanup_removes_expired_clients(self, server, clock):
+        """_cleanup should drop clients whose two windows have both expired."""
+        limiter = server.RateLimiter(max_requests=5, time_window_seconds=60, clock=clock)
+        limiter.is_allowed('old')
+        clock.now += 100
+        limiter.is_allowed('recent')
+
+        limiter._cleanup(clock.now + 30)
+
+        assert list(limiter.requests) == ['recent']
+
+    @pytest.mark.asyncio
+    async def test_cleanup_periodically_stops_on_cancel(self, server):
+        """The background cleanup task should exit cleanly when cancelled."""
+        limiter = server.RateLimiter(cleanup_interval=0, clock=_Clock())
+        limiter._cleanup = MagicMock()
+
+        task = asyncio.create_task(limiter.cleanup_periodically())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await task
+
+        assert limiter._cleanup.called
+        assert task.done() and not task.cancelled()
+
+
+class TestSearchResultCache:
+    """Test the search result cache."""
+
+    @staticmethod
+    def _counting_search(result=None, error=None, delay=0.01):
+        """Build a search coroutine function that counts its invocations."""
+        calls = []
+
+        async def search():
+            calls.append(1)
+            await asyncio.sleep(delay)
+            if error is not None:
+                raise error
+            return result
+
+        return search, calls
+
+    @pytest.mark.asyncio
+    async def test_repeated_search_served_from_cache(self, server):
+        """A second identical search within the TTL should not hit the backend."""
+        cache = server.SearchResultCache(ttl_seconds=60)
+        search, calls = self._counting_search(result='hits')
+
+        assert await cache.get_or_search(('k',), search) == 'hits'
+        assert await cache.get_or_search(('k',), search) == 'hits'
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, server):
+        """With the default TTL of 0 every call should search."""
+        cache = server.SearchResultCache()
+        search, calls = self._counting_search(result='hits')
+
+        await cache.get_or_search(('k',), search)
+        await cache.get_or_search(('k',), search)
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_search(self, server):
+        """Concurrent callers for the same key should coalesce into one search."""
+        cache = server.SearchResultCache(ttl_seconds=60)
+        search, calls = self._counting_search(result='hits')
+
+        results = await asyncio.gather(*(cache.get_or_search(('k',), search) for _ in range(5)))
+
+        assert results == ['hits'] * 5
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_search_fails_all_waiters(self, server):
+        """Waiters should receive the leader's error instead of searching again."""
+        cache = server.SearchResultCache(ttl_seconds=60)
+        search, calls = self._counting_search(error=RuntimeError('database down'))
+
+        results = await asyncio.gather(
+            *(cache.get_or_search(('k',), search) for _ in range(5)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert len(calls) == 1
+        assert not cache._inflight
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_cached_results(self, server):
+        """invalidate() should force the next search to hit the backend."""
+        cache = server.SearchResultCache(ttl_seconds=60)
+        search, calls = self._counting_search(result='hits')
+
+        await cache.get_or_search(('k',), search)
+        cache.invalidate()
+        await cache.get_or_search(('k',), search)
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_search_started_before_invalidate_is_not_stored(self, server):
+        """A result computed across an invalidation should not be cached."""
+        cache = server.SearchResultCache(ttl_seconds=60)
+        search, calls = self._counting_search(result='stale', delay=0.05)
+
+        pending = asyncio.create_task(cache.get_or_search(('k',), search))
+        await asyncio.sleep(0.01)
+        cache.invalidate()
+        assert await pending == 'stale'
+
+        await cache.get_or_search(('k',), search)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_entry(self, server):
+        """Beyond max_entries the least recently used result should be dropped."""
+        cache = server.SearchResultCache(max_entries=2, ttl_seconds=60)
+        search, _ = self._counting_search(result='hits', delay=0)
+
+        for key in (('a',), ('b',), ('a',), ('c',)):
+            await cache.get_or_search(key, search)
+
+        assert list(cache._entries) == [('a',), ('c',)]
+
+
+class TestParseDateInput:
+    """Test ISO and relative date parsing for temporal filters."""
+
+    @pytest.mark.parametrize('value', [
+        '2026-01-26T10:00:00',
+        '2026-01-26t10:00:00',
+        '2026-01-26X10:00',
+        '2026-01-26T10:00:00 +00:00',
+        '2026-01-26T10,5',
+        '2026W041',
+        '20260126',
+    ])
+    def test_accepts_fromisoformat_inputs(self, server, value):
+        """Anything datetime.fromisoformat accepts should parse."""
+        assert server.parse_date_input(value) == datetime.fromisoformat(value)
+
+    def test_date_only_is_midnight_utc(self, server):
+        """A bare YYYY-MM-DD date should be midnight UTC."""
+        assert server.parse_date_input('2026-01-26') == datetime(2026, 1, 26, tzinfo=timezone.utc)
+
+    def test_z_suffix_is_utc(self, server):
+        """A trailing Z should be read as UTC."""
+        assert server.parse_date_input('2026-01-26T10:00:00Z') == datetime(2026, 1, 26, 10, tzinfo=timezone.utc)
+
+    @pytest.mark.parametrize('value, delta', [
+        ('7d', timedelta(days=7)),
+        ('7 days ago', timedelta(days=7)),
+        ('1w', timedelta(weeks=1)),
+        ('2 months', timedelta(days=60)),
+    ])
+    def test_durations_are_relative_to_now(self, server, value, delta):
+        """Durations should resolve to now minus the duration."""
+        before = datetime.now(timezone.utc)
+        parsed = server.parse_date_input(value)
+        after = datetime.now(timezone.utc)
+
+        assert before - delta <= parsed <= after - delta
+
+    def test_now_is_not_memoized(self, server):
+        """'now' should be resolved on every call, not reused from a cache."""
+        for _ in range(2):
+            before = datetime.now(timezone.utc)
+            parsed = server.parse_date_input('now')
+            after = datetime.now(timezone.utc)
+
+            assert before <= parsed <= after
+
+    def test_today_is_utc_midnight(self, server):
+        """'today' should be the start of the current UTC day."""
+        midnight = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        assert server.parse_date_input('Today') == midnight
+
+    @pytest.mark.parametrize('value', [None, ''])
+    def test_empty_input_returns_none(self, server, value):
+        """None and empty strings mean no filter."""
+        assert server.parse_date_input(value) is None
+
+    @pytest.mark.parametrize('value', ['garbage', '2026-13-40'])
+    def test_invalid_input_raises(self, server, value):
+        """Unparseable input should raise ValueError."""
+        with pytest.raises(ValueError, match='Cannot parse date'):
+            server.parse_date_input(value)
+
+    @pytest.mark.parametrize('value, absolute', [
+        ('2026-01-26', True),
+        ('2026-01-26T10:00:00+05:30', True),
+        ('7d', False),
+        ('today', False),
+        ('now', False),
+        ('2026-13-40', False),
+    ])
+    def test_parse_absolute_date_only_accepts_iso(self, server, value, absolute):
+        """Only absolute ISO dates are stable enough to key cached searches on."""
+        assert (server._parse_absolute_date(value) is not None) is absolute
+
+    def test_to_utc_treats_naive_as_utc(self, server):
+        """Naive datetimes should be tagged UTC and aware ones converted."""
+        ist = timezone(timedelta(hours=5, minutes=30))
+
+        assert server._to_utc(datetime(2026, 1, 26)) == datetime(2026, 1, 26, tzinfo=timezone.utc)
+        assert server._to_utc(datetime(2026, 1, 26, 10, 30, tzinfo=ist)).tzinfo == timezone.utc
+        assert server._to_utc(datetime(2026, 1, 26, 10, 30, tzinfo=ist)).hour == 5
+
+
+class TestValidateConfigPath:
+    """Test config path validation against the allowed base directories."""
+
+    @pytest.fixture
+    def allowed_base(self, server, tmp_path, monkeypatch):
+        """Make tmp_path/app/config the only allowed base."""
+        base = tmp_path / 'app' / 'config'
+        base.mkdir(parents=True)
+        monkeypatch.setattr(
+            server, '_allowed_config_prefixes', lambda: (os.path.join(str(base.resolve()), ''),)
+        )
+        return base
+
+    def test_accepts_yaml_inside_allowed_base(self, server, allowed_base):
+        """A YAML file inside an allowed base should be returned resolved."""
+        config = allowed_base / 'nested' / 'config.yaml'
+        config.parent.mkdir()
+        config.write_text('server: {}\n')
+
+        assert server.validate_config_path(config) == config.resolve()
+
+    def test_rejects_sibling_prefix_directory(self, server, allowed_base):
+        """/app/config-evil must not pass as being inside /app/config."""
+        evil = allowed_base.parent / 'config-evil'
+        evil.mkdir()
+        config = evil / 'c.yaml'
+        config.write_text('server: {}\n')
+
+        with pytest.raises(server.ConfigPathError, match='within allowed directories'):
+            server.validate_config_path(config)
+
+    def test_rejects_symlink_resolving_outside_bases(self, server, allowed_base, tmp_path):
+        """A link inside a base pointing outside it should be judged by its target."""
+        outside = tmp_path / 'outside.yaml'
+        outside.write_text('server: {}\n')
+        link = allowed_base / 'link.yaml'
+        link.symlink_to(outside)
+
+        with pytest.raises(server.ConfigPathError, match='within allowed directories'):
+            server.validate_config_path(link)
+
+    def test_rejects_non_yaml_extension(self, server, allowed_base):
+        """Files inside a base must still have a .yaml or .yml extension."""
+        config = allowed_base / 'config.json'
+        config.write_text('{}')
+
+        with pytest.raises(server.ConfigPathError, match='.yaml or .yml'):
+            server.validate_config_path(config)
+
+    def test_rejects_missing_path(self, server, allowed_base):
+        """Paths that do not exist should be rejected."""
+        with pytest.raises(server.ConfigPathError, match='does not exist'):
+            server.validate_config_path(allowed_base / 'missing.yaml')
+
+    def test_default_prefixes_include_cwd_with_separator(self, server):
+        """Default prefixes should include the working directory, separator-terminated."""
+        prefixes = server._allowed_config_prefixes()
+
+        assert all(prefix.endswith(os.sep) for prefix in prefixes)
+        assert os.path.join(str(Path.cwd().resolve()), '') in prefixes
+
+
+class TestBulkDeleteTools:
+    """Test delete_entity_edges and delete_episodes."""
+
+    @pytest.fixture
+    def driver(self, server, monkeypatch):
+        """Install a graphiti service whose driver.execute_query is mocked."""
+        client = MagicMock()
+        client.driver.execute_query = AsyncMock(return_value=([{'deleted': 2}], None, None))
+        service = MagicMock()
+        service.get_client = AsyncMock(return_value=client)
+        monkeypatch.setattr(server, 'graphiti_service', service)
+        return client.driver
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('tool, query, noun', [
+        ('delete_entity_edges', 'DELETE_ENTITY_EDGES_QUERY', 'entity edges'),
+        ('delete_episodes', 'DELETE_EPISODES_QUERY', 'episodes'),
+    ])
+    async def test_reports_deleted_count(self, server, driver, tool, query, noun):
+        """The deleted count from the query should be reported against the request."""
+        result = await getattr(server, tool)(['u1', 'u2', 'u3'])
+
+        assert result == {'message': f'Deleted 2 of 3 {noun}'}
+        driver.execute_query.assert_awaited_once_with(getattr(server, query), uuids=['u1', 'u2', 'u3'])
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('tool', ['delete_entity_edges', 'delete_episodes'])
+    async def test_empty_records_count_as_zero(self, server, driver, tool):
+        """A query returning no records should report zero deletions."""
+        driver.execute_query.return_value = ([], None, None)
+
+        result = await getattr(server, tool)(['u1'])
+
+        assert result['message'].startswith('Deleted 0 of 1 ')
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('tool', ['delete_entity_edges', 'delete_episodes'])
+    async def test_empty_uuids_is_an_error(self, server, driver, tool):
+        """An empty UUID list should be rejected without touching the database."""
+        result = await getattr(server, tool)([])
+
+        assert result == {'error': 'No UUIDs specified for deletion'}
+        driver.execute_query.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('tool', ['delete_entity_edges', 'delete_episodes'])
+    async def test_invalidates_search_cache(self, server, driver, tool, monkeypatch):
+        """A successful delete should drop cached search results."""
+        cache = MagicMock()
+        monkeypatch.setattr(server, '_search_cache', cache)
+
+        await getattr(server, tool)(['u1'])
+
+        cache.invalidate.assert_called_once_with()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('tool', ['delete_entity_edges', 'delete_episodes'])
+    async def test_database_error_is_reported(self, server, driver, tool, monkeypatch):
+        """A failing query should return an error and leave the cache alone."""
+        driver.execute_query.side_effect = RuntimeError('database down')
+        cache = MagicMock()
+        monkeypatch.setattr(server, '_search_cache', cache)
+
+        result = await getattr(server, tool)(['u1'])
+
+        assert 'database down' in result['error']
+        cache.invalidate.assert_not_called()